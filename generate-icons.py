@@ -2,26 +2,49 @@
 """
 Generate PWA icons in all required sizes from the original logo,
 including maskable versions for Android.
+
+Requires Pillow. Pillow-SIMD (``pip install pillow-simd`` in place of
+``pillow``) is a drop-in replacement with vectorized LANCZOS resampling and
+speeds up the resize step considerably; no code changes are needed.
+
+If ``oxipng`` is on the PATH, icons are written with fast zlib settings and
+then recompressed by oxipng in one parallel pass, which is both quicker and
+smaller than Pillow's ``optimize=True``.
 """
 
-from PIL import Image, ImageOps
+import argparse
+import io
 import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageOps
 
 # Icon sizes needed for PWA
 ICON_SIZES = [
     48, 72, 96, 120, 128, 144, 152, 180, 192, 256, 384, 512, 1024
 ]
 
-def create_icon(input_path, output_path, size, maskable=False):
+# Sizes that also get a maskable variant (referenced by the manifest in vite.config.ts)
+MASKABLE_SIZES = [192, 512]
+
+def create_icon(source, output_path, size, maskable=False, has_alpha=True,
+                optimize=True):
     """Create a square icon with the logo centered on a white background.
 
     The brand logo is a standalone green/blue mark with navy text on white,
     so ALL icons (standard, maskable, apple-touch) use a solid white
     background to guarantee the logo is never cropped or letterboxed by
     Android adaptive icons or iOS squircle masks (Facebook/Pinterest style).
+
+    ``source`` is the already-decoded logo; it is copied, never modified.
+    Pass ``has_alpha=False`` when the source is fully opaque to skip the
+    slower masked paste. Pass ``optimize=False`` for a fast, lightly
+    compressed save when the PNG is recompressed afterwards.
     """
-    # Open the original image
-    img = Image.open(input_path)
+    # Work on a copy so the decoded source can be reused for every size
+    img = source.copy()
 
     if maskable:
         # Maskable icons need a safe zone. The logo should be within the center 80%
@@ -43,18 +66,71 @@ def create_icon(input_path, output_path, size, maskable=False):
     y = (size - img.height) // 2
     
     # Paste the logo onto the square image
-    # Use the image itself as a mask if it has an alpha channel
-    mask = img if img.mode == 'RGBA' else None
+    # Use the image itself as a mask if it has any transparent pixels
+    mask = img if has_alpha and img.mode == 'RGBA' else None
     square_img.paste(img, (x, y), mask)
     
     # Save the icon
-    square_img.save(output_path, 'PNG', optimize=True)
+    if optimize:
+        square_img.save(output_path, 'PNG', optimize=True)
+    else:
+        square_img.save(output_path, 'PNG', compress_level=1)
     print(f"Created: {output_path} ({size}x{size}){' [Maskable]' if maskable else ''}")
 
-def main():
+# Decoded logo, set once per worker process by _init_worker()
+_source = None
+_has_alpha = True
+
+def _init_worker(raw):
+    """Process pool initializer; decodes the logo bytes once per worker."""
+    global _source, _has_alpha
+    _source = Image.open(io.BytesIO(raw))
+    _source.load()
+    # A fully opaque RGBA logo can be pasted without per-pixel blending
+    _has_alpha = (_source.mode == 'RGBA'
+                  and _source.getchannel('A').getextrema()[0] < 255)
+
+def _one_icon(args):
+    """Process pool entry point; unpacks a job tuple for create_icon()."""
+    output_path, size, maskable, optimize = args
+    create_icon(_source, output_path, size, maskable, _has_alpha, optimize)
+
+def parse_args():
     base_dir = os.path.dirname(os.path.abspath(__file__))
-    input_logo = os.path.join(base_dir, 'public/icons/original-logo.png')
-    output_dir = os.path.join(base_dir, 'public/icons')
+    default_icons_dir = os.path.join(base_dir, 'public', 'icons')
+
+    parser = argparse.ArgumentParser(description='Generate PWA icons from the logo.')
+    parser.add_argument(
+        '--input',
+        default=os.path.join(default_icons_dir, 'original-logo.png'),
+        help='source logo (default: public/icons/original-logo.png)',
+    )
+    parser.add_argument(
+        '--output-dir',
+        default=default_icons_dir,
+        help='directory to write icons to (default: public/icons)',
+    )
+    parser.add_argument(
+        '--maskable-sizes',
+        type=int,
+        nargs='*',
+        default=MASKABLE_SIZES,
+        metavar='SIZE',
+        help='sizes that also get a maskable variant (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--no-maskable',
+        dest='maskable_sizes',
+        action='store_const',
+        const=[],
+        help='skip maskable icons entirely',
+    )
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    input_logo = args.input
+    output_dir = args.output_dir
     
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
@@ -62,19 +138,46 @@ def main():
     print("Generating PWA icons...")
     print("-" * 50)
     
-    for size in ICON_SIZES:
+    # Read the logo once and ship the compressed bytes to the workers, which
+    # are far smaller to pickle than a decoded image
+    with open(input_logo, 'rb') as f:
+        raw = f.read()
+    
+    # Leave compression to oxipng when it is installed
+    oxipng = shutil.which('oxipng')
+    optimize = oxipng is None
+    
+    # Maskable sizes may fall outside ICON_SIZES; those get only a maskable icon
+    jobs = []
+    for size in sorted(set(ICON_SIZES) | set(args.maskable_sizes)):
         # Standard icon
-        output_path = os.path.join(output_dir, f'icon-{size}x{size}.png')
-        create_icon(input_logo, output_path, size, maskable=False)
+        if size in ICON_SIZES:
+            output_path = os.path.join(output_dir, f'icon-{size}x{size}.png')
+            jobs.append((output_path, size, False, optimize))
         
         # Maskable icon (specifically for larger sizes used by Android)
-        if size in [192, 512]:
+        if size in args.maskable_sizes:
             maskable_path = os.path.join(output_dir, f'icon-{size}x{size}-maskable.png')
-            create_icon(input_logo, maskable_path, size, maskable=True)
+            jobs.append((maskable_path, size, True, optimize))
+    
+    # Icons are independent and PNG encoding is CPU-bound, so spread the jobs
+    # over processes rather than threads
+    with ProcessPoolExecutor(initializer=_init_worker, initargs=(raw,)) as executor:
+        list(executor.map(_one_icon, jobs))
+    
+    if oxipng:
+        print("Optimizing icons with oxipng...")
+        subprocess.run(
+            [oxipng, '-o', '4', '--strip', 'safe', '-t', str(os.cpu_count() or 1),
+             *(job[0] for job in jobs)],
+            check=True,
+        )
     
-    # Also create apple-touch-icon
+    # Also create apple-touch-icon; it is pixel-for-pixel the standard 180px
+    # icon, so copy that file rather than rendering it again
     apple_icon_path = os.path.join(output_dir, 'apple-touch-icon.png')
-    create_icon(input_logo, apple_icon_path, 180, maskable=False)
+    shutil.copyfile(os.path.join(output_dir, 'icon-180x180.png'), apple_icon_path)
+    print(f"Created: {apple_icon_path} (180x180)")
     
     print("-" * 50)
     print(f"✅ Successfully generated icons!")